@@ -0,0 +1,235 @@
+"""
+Local stand-in for the provider APIs the checker talks to. Google, Azure and
+GitHub endpoints answer with the same JSON shapes (and HTTP statuses) as the
+real services, so the provider parsers run exactly as they do in production.
+Any other path answers 404.
+
+Whether a key is valid is decided by a hash of the key, so the same key file
+always gives the same results. Latency, the share of invalid keys, the share
+of 5xx errors and bursts of throttled responses are all configurable, and
+single providers can be made slower than the rest.
+
+Run it on its own to point a manual run at it:
+
+    python benchmarks/mock_provider.py --port 8080 --latency 50
+    python main.py --service all --key-file keys.txt --base-url all=http://127.0.0.1:8080
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+# Successful response bodies, by path
+VALID_RESPONSES = {
+    '/maps/api/geocode/json': {"results": [{"formatted_address": "New York, NY, USA"}], "status": "OK"},
+    '/youtube/v3/search': {"kind": "youtube#searchListResponse", "items": []},
+    '/v1/images:annotate': {"responses": [{"labelAnnotations": [{"description": "Face", "score": 0.97}]}]},
+    '/language/translate/v2': {"data": {"translations": [{"translatedText": "hola"}]}},
+    '/bing/v7.0/search': {"_type": "SearchResponse", "webPages": {"value": []}},
+    '/vision/v3.1/analyze': {"categories": [{"name": "outdoor_", "score": 0.9}], "requestId": "0"},
+    '/user': {"login": "octocat", "id": 1},
+    '/user/repos': [],
+}
+
+PROVIDER_PATHS = {
+    'google': ('/maps/api/geocode/json', '/youtube/v3/search', '/v1/images:annotate', '/language/translate/v2'),
+    'azure': ('/bing/v7.0/search', '/vision/v3.1/analyze'),
+    'github': ('/user', '/user/repos'),
+}
+PATH_PROVIDERS = {path: provider for provider, paths in PROVIDER_PATHS.items() for path in paths}
+
+
+def invalid_response(provider, path):
+    """Status, headers and body each provider sends for a rejected key."""
+    if path == '/maps/api/geocode/json':
+        # The Geocoding API reports auth failures in a 200 body
+        return 200, {}, {"error_message": "The provided API key is invalid.", "results": [], "status": "REQUEST_DENIED"}
+    if provider == 'google':
+        return 400, {}, {"error": {"code": 400, "message": "API key not valid. Please pass a valid API key.",
+                                   "status": "INVALID_ARGUMENT",
+                                   "details": [{"@type": "type.googleapis.com/google.rpc.ErrorInfo",
+                                                "reason": "API_KEY_INVALID"}]}}
+    if provider == 'azure':
+        return 401, {}, {"error": {"code": "401", "message": "Access denied due to invalid subscription key or wrong "
+                                                             "API endpoint. Make sure to provide a valid key for an "
+                                                             "active subscription and use a correct regional API "
+                                                             "endpoint for your resource."}}
+    return 401, {}, {"message": "Bad credentials", "documentation_url": "https://docs.github.com/rest"}
+
+
+def throttled_response(provider, retry_after):
+    """Status, headers and body each provider sends when it throttles a caller."""
+    if provider == 'google':
+        return 429, {'Retry-After': retry_after}, {"error": {"code": 429, "message": "Quota exceeded for quota metric "
+                                                                                     "'Requests' of service.",
+                                                             "status": "RESOURCE_EXHAUSTED"}}
+    if provider == 'azure':
+        return 429, {'Retry-After': retry_after}, {"error": {"code": "429", "message": "Rate limit is exceeded. Try "
+                                                                                     "again in 1 seconds."}}
+    # GitHub signals its primary rate limit with a 403
+    reset = str(int(time.time() + float(retry_after)))
+    return 403, {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': reset}, \
+        {"message": "API rate limit exceeded for user ID 1.", "documentation_url": "https://docs.github.com/rest"}
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 refuses connections under a wide worker pool
+    request_queue_size = 1024
+
+
+class MockProvider:
+    """
+    Threaded HTTP server imitating the provider APIs. latency and jitter are
+    in milliseconds; provider_latency maps providers to their own mean
+    latency. Every burst_every requests the next burst_length are
+    throttled, with Retry-After set to retry_after seconds; with
+    burst_provider only that provider's requests are counted and throttled.
+    Counters of the requests served are kept for the benchmark report.
+    """
+    def __init__(self, host='127.0.0.1', port=0, latency=20, jitter=10, invalid_ratio=0.5, error_ratio=0.01,
+                 burst_every=0, burst_length=20, retry_after='1', seed=0, provider_latency=None,
+                 burst_provider=None):
+        self.latency = latency / 1000
+        self.provider_latency = {name: value / 1000 for name, value in (provider_latency or {}).items()}
+        self.jitter = jitter / 1000
+        self.invalid_ratio = invalid_ratio
+        self.error_ratio = error_ratio
+        self.burst_every = burst_every
+        self.burst_length = burst_length
+        self.retry_after = str(retry_after)
+        self.burst_provider = burst_provider
+        self.burst_requests = 0
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.throttled = 0
+        self.errors = 0
+
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def handle_request(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                if length:
+                    self.rfile.read(length)
+                status, headers, body = mock.respond(self.path, self.headers)
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=UTF-8')
+                self.send_header('Content-Length', str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = handle_request
+            do_POST = handle_request
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = MockServer((host, port), Handler)
+        self.url = f"http://{host}:{self.server.server_port}"
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def counters(self):
+        with self.lock:
+            return {'requests': self.requests, 'throttled': self.throttled, 'errors': self.errors}
+
+    def is_valid(self, key):
+        return (zlib.crc32(key.encode()) % 1000) >= self.invalid_ratio * 1000
+
+    def respond(self, raw_path, headers):
+        """Status, headers and JSON body for one request."""
+        url = urlsplit(raw_path)
+        provider = PATH_PROVIDERS.get(url.path)
+        with self.lock:
+            self.requests += 1
+            throttle = False
+            if self.burst_every and self.burst_provider in (None, provider):
+                self.burst_requests += 1
+                throttle = self.burst_requests % self.burst_every < self.burst_length
+            error = not throttle and self.random.random() < self.error_ratio
+            latency = self.provider_latency.get(provider, self.latency)
+            delay = max(0, latency + self.random.uniform(-self.jitter, self.jitter))
+            if throttle:
+                self.throttled += 1
+            elif error:
+                self.errors += 1
+        if delay:
+            time.sleep(delay)
+
+        if provider is None:
+            return 404, {}, {"message": "Not Found"}
+        if throttle:
+            return throttled_response(provider, self.retry_after)
+        if error:
+            return 503, {}, {"error": {"code": 503, "message": "The service is currently unavailable.",
+                                       "status": "UNAVAILABLE"}}
+
+        key = (parse_qs(url.query).get('key', [''])[0] or headers.get('Ocp-Apim-Subscription-Key')
+               or headers.get('Authorization', '').split(' ')[-1])
+        if not key or not self.is_valid(key):
+            return invalid_response(provider, url.path)
+        return 200, {}, VALID_RESPONSES[url.path]
+
+
+def add_mock_arguments(parser):
+    parser.add_argument('--latency', type=float, default=20, help='Mean response latency in ms (Defaults to 20)')
+    parser.add_argument('--provider-latency', action='append', default=[], metavar='PROVIDER=MS',
+                        help='Mean latency of one provider (google, azure or github), can be repeated')
+    parser.add_argument('--jitter', type=float, default=10, help='Latency varies by up to this many ms (Defaults to 10)')
+    parser.add_argument('--invalid-ratio', type=float, default=0.5, help='Share of keys rejected (Defaults to 0.5)')
+    parser.add_argument('--error-ratio', type=float, default=0.01, help='Share of requests answered with a 503 (Defaults to 0.01)')
+    parser.add_argument('--burst-every', type=int, default=0,
+                        help='Start a burst of throttled responses every N requests, 0 disables (Defaults to 0)')
+    parser.add_argument('--burst-length', type=int, default=20, help='Requests throttled per burst (Defaults to 20)')
+    parser.add_argument('--retry-after', type=str, default='1', help='Retry-After sent with throttled responses (Defaults to 1)')
+    parser.add_argument('--burst-provider', choices=sorted(PROVIDER_PATHS),
+                        help='Throttle only this provider (Defaults to all of them)')
+    parser.add_argument('--seed', type=int, default=0)
+
+
+def mock_from_args(args, host='127.0.0.1', port=0):
+    return MockProvider(host=host, port=port, latency=args.latency, jitter=args.jitter,
+                        invalid_ratio=args.invalid_ratio, error_ratio=args.error_ratio,
+                        burst_every=args.burst_every, burst_length=args.burst_length,
+                        retry_after=args.retry_after, seed=args.seed, burst_provider=args.burst_provider,
+                        provider_latency={name: float(value) for name, _, value in
+                                          (option.partition('=') for option in args.provider_latency)})
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local mock of the provider APIs')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    add_mock_arguments(parser)
+    args = parser.parse_args()
+
+    mock = mock_from_args(args, host=args.host, port=args.port)
+    print(f"Mock provider listening on {mock.url}")
+    try:
+        mock.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
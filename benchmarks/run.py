@@ -0,0 +1,178 @@
+"""
+Throughput benchmark for the key checker. A MockProvider is started locally,
+every provider base URL is pointed at it, and process_key_file is run over
+synthetic key files (Google, Azure and GitHub keys, in equal parts) of each
+requested size. Each size runs in a fresh process so peak RSS is its own.
+
+    python benchmarks/run.py
+    python benchmarks/run.py --sizes 1000,10000 --engine async --concurrency 200
+    python benchmarks/run.py --sizes 10000 --burst-every 500 --retry-after 0.2
+
+Reports keys/s, requests/s (as counted by the mock), p50/p99 probe latency
+(including retries) and peak RSS for every size.
+"""
+import argparse
+import contextlib
+import multiprocessing
+import os
+import queue
+import random
+import resource
+import string
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_provider import add_mock_arguments, mock_from_args  # noqa: E402
+
+
+def synthetic_key(service, rng):
+    """A key in the service's format, so the pre-filter routes it there."""
+    if service == 'google':
+        return "AIza" + "".join(rng.choices(string.ascii_letters + string.digits + "_-", k=35))
+    if service == 'azure':
+        return "".join(rng.choices("0123456789abcdef", k=32))
+    return "ghp_" + "".join(rng.choices(string.ascii_letters + string.digits, k=36))
+
+
+def write_key_file(path, count, seed):
+    rng = random.Random(seed)
+    services = ('google', 'azure', 'github')
+    with open(path, "w") as f:
+        for i in range(count):
+            f.write(synthetic_key(services[i % len(services)], rng) + "\n")
+
+
+class LatencyRecorder:
+    """Takes the place of a ResultWriter and keeps only what the report needs."""
+    def __init__(self):
+        self.latencies = []
+        self.rate_limited = 0
+
+    def write(self, record):
+        if record['latency_ms'] is not None:
+            self.latencies.append(record['latency_ms'])
+        if record['status'] == "RATE LIMITED":
+            self.rate_limited += 1
+
+    def close(self):
+        pass
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run_checker(key_file, base_url, options, results):
+    """Child process body: validate key_file against the mock and report back."""
+    import main as checker
+
+    recorder = LatencyRecorder()
+    validator = checker.APIValidator(output_format="plain", log_dir=os.path.join(os.path.dirname(key_file), "logs"), workers=options['workers'],
+                                     base_urls={name: base_url for name in checker.BASE_URLS},
+                                     strategy=options['strategy'],
+                                     # The provider files' own limits assume one host per provider;
+                                     # here every provider shares the mock's host
+                                     rate_limiter=checker.RateLimiter(default_rate=options['rate_limit']),
+                                     results_writer=recorder, quiet=True)
+    engine = None
+    if options['engine'] == 'async':
+        engine = checker.AsyncEngine(validator, concurrency=options['concurrency'],
+                                     provider_concurrency=options['provider_concurrency'])
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        started = time.perf_counter()
+        success, errors, skipped = checker.process_key_file(key_file, validator, 'all', engine, progress_interval=0)
+        elapsed = time.perf_counter() - started
+        validator.close()
+
+    results.put({
+        'elapsed': elapsed,
+        'success': success,
+        'errors': errors,
+        'p50': percentile(recorder.latencies, 0.50),
+        'p99': percentile(recorder.latencies, 0.99),
+        'rate_limited': recorder.rate_limited,
+        # ru_maxrss is in kilobytes on Linux
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    })
+
+
+def benchmark(size, mock, options, work_dir):
+    key_file = os.path.join(work_dir, f"keys-{size}.txt")
+    write_key_file(key_file, size, options['seed'])
+
+    before = mock.counters()
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    child = context.Process(target=run_checker, args=(key_file, mock.url, options, results))
+    child.start()
+    while True:
+        try:
+            report = results.get(timeout=1)
+            break
+        except queue.Empty:
+            if not child.is_alive():
+                raise RuntimeError(f"Benchmark of {size} keys exited with code {child.exitcode}")
+    child.join()
+    after = mock.counters()
+
+    requests_sent = after['requests'] - before['requests']
+    report.update({
+        'size': size,
+        'keys_per_second': size / report['elapsed'],
+        'requests_per_second': requests_sent / report['elapsed'],
+        'requests': requests_sent,
+        'throttled': after['throttled'] - before['throttled'],
+    })
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the key checker against a local mock provider')
+    parser.add_argument('--sizes', type=str, default='1000,10000,100000',
+                        help='Comma separated key file sizes (Defaults to 1000,10000,100000)')
+    parser.add_argument('--engine', choices=['thread', 'async'], default='thread')
+    parser.add_argument('--workers', type=int, default=32, help='Worker threads for the thread engine (Defaults to 32)')
+    parser.add_argument('--concurrency', type=int, default=100, help='Probes in flight for the async engine (Defaults to 100)')
+    parser.add_argument('--provider-concurrency', type=int, default=50,
+                        help='Probes in flight per provider for the async engine (Defaults to 50)')
+    parser.add_argument('--strategy', choices=['full', 'first-valid', 'fail-fast'], default='full')
+    parser.add_argument('--rate-limit', type=float, default=None, help='Requests per second to the mock (Defaults to unlimited)')
+    add_mock_arguments(parser)
+    args = parser.parse_args()
+
+    options = {
+        'engine': args.engine,
+        'workers': args.workers,
+        'concurrency': args.concurrency,
+        'provider_concurrency': args.provider_concurrency,
+        'strategy': args.strategy,
+        'rate_limit': args.rate_limit,
+        'seed': args.seed,
+    }
+    mock = mock_from_args(args).start()
+    print(f"Mock provider on {mock.url} ({args.latency:g}ms ±{args.jitter:g}ms, {args.invalid_ratio:.0%} invalid, "
+          f"{args.error_ratio:.0%} errors, burst every {args.burst_every or '-'})")
+    print(f"Engine: {args.engine}, workers {args.workers}, concurrency {args.concurrency}, strategy {args.strategy}\n")
+    print(f"{'keys':>8} {'seconds':>9} {'keys/s':>9} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} "
+          f"{'throttled':>9} {'rate ltd':>8} {'peak RSS':>9}")
+
+    try:
+        with tempfile.TemporaryDirectory(prefix="bench-") as work_dir:
+            for size in (int(size) for size in args.sizes.split(',')):
+                report = benchmark(size, mock, options, work_dir)
+                print(f"{report['size']:>8} {report['elapsed']:>9.2f} {report['keys_per_second']:>9.1f} "
+                      f"{report['requests_per_second']:>9.1f} {report['p50']:>8.1f} {report['p99']:>8.1f} "
+                      f"{report['throttled']:>9} {report['rate_limited']:>8} {report['peak_rss_mb']:>7.1f}MB")
+    finally:
+        mock.stop()
+
+
+if __name__ == "__main__":
+    main()
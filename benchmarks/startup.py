@@ -0,0 +1,83 @@
+"""
+Start-up budget check for the key checker. Imports main under
+`python -X importtime` a few times and takes the best cumulative import time,
+checks that no provider back-end (requests, urllib3, aiohttp, botocore, ...)
+is imported before a key needs it, and times `main.py --help` end to end.
+
+    python benchmarks/startup.py
+    python benchmarks/startup.py --budget-ms 80 --runs 10
+
+Exits with status 1 when the import time exceeds the budget or a back-end is
+imported eagerly, so it can guard against start-up regressions in CI.
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Imported on first use only; none of them may show up in `import main`
+LAZY_MODULES = ('requests', 'urllib3', 'aiohttp', 'asyncio', 'botocore', 'boto3',
+                'sqlite3', 'csv', 'gzip', 'cProfile', 'pstats', 'http.server', 'socketserver')
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_profile():
+    """(cumulative µs of main, names of every module imported by it) for one fresh interpreter."""
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"], cwd=ROOT,
+                               capture_output=True, text=True, check=True)
+    # Modules are listed children first, each just before its parent
+    lines = [IMPORT_LINE.match(line) for line in completed.stderr.splitlines()]
+    lines = [match for match in lines if match]
+    end = next(index for index, match in enumerate(lines) if match.group(4) == 'main' and len(match.group(3)) == 1)
+    start = end
+    while start > 0 and len(lines[start - 1].group(3)) > len(lines[end].group(3)):
+        start -= 1
+    return int(lines[end].group(2)), {match.group(4) for match in lines[start:end]}
+
+
+def help_time():
+    started = time.perf_counter()
+    subprocess.run([sys.executable, os.path.join(ROOT, "main.py"), "--help"], cwd=ROOT,
+                   stdout=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check the start-up time of main.py against a budget')
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters to measure (Defaults to 5)')
+    parser.add_argument('--budget-ms', type=float, default=100,
+                        help='Largest acceptable cumulative import time of main in ms (Defaults to 100)')
+    args = parser.parse_args()
+
+    import_times = []
+    eager = set()
+    for _ in range(args.runs):
+        micros, modules = import_profile()
+        import_times.append(micros / 1000)
+        eager.update(name for name in LAZY_MODULES if name in modules)
+    help_times = [help_time() * 1000 for _ in range(args.runs)]
+
+    best = min(import_times)
+    print(f"import main: best {best:.1f}ms, worst {max(import_times):.1f}ms over {args.runs} runs "
+          f"(budget {args.budget_ms:g}ms)")
+    print(f"main.py --help: best {min(help_times):.1f}ms, worst {max(help_times):.1f}ms (interpreter included)")
+
+    failed = False
+    if best > args.budget_ms:
+        print(f"FAIL: import time over budget by {best - args.budget_ms:.1f}ms")
+        failed = True
+    if eager:
+        print(f"FAIL: imported at start-up instead of on first use: {', '.join(sorted(eager))}")
+        failed = True
+    if not failed:
+        print("OK")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import main as checker  # noqa: E402
+from mock_provider import MockProvider  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def mock():
+    """A MockProvider with no latency, no 5xx errors and no throttling."""
+    provider = MockProvider(latency=0, jitter=0, error_ratio=0).start()
+    yield provider
+    provider.stop()
+
+
+@pytest.fixture
+def make_validator(mock, tmp_path):
+    """Build APIValidators pointed at the mock; each is closed after the test."""
+    validators = []
+
+    def make(log_dir="logs", **options):
+        options.setdefault('rate_limiter', checker.RateLimiter(default_rate=None))
+        options['base_urls'] = dict({name: mock.url for name in checker.BASE_URLS}, **options.get('base_urls', {}))
+        validator = checker.APIValidator(output_format="plain", log_dir=str(tmp_path / log_dir), quiet=True,
+                                         **options)
+        validators.append(validator)
+        return validator
+
+    yield make
+    for validator in validators:
+        validator.close()
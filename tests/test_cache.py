@@ -0,0 +1,45 @@
+import contextlib
+import io
+
+import pytest
+
+import main as checker
+
+GITHUB_TOKEN = "ghp_" + "a" * 36
+
+
+@pytest.mark.parametrize("result", [
+    checker.ProbeResult(429, "Too Many Requests", False),
+    checker.ProbeResult(403, "API rate limit exceeded", False, rate_limited=True),
+    checker.ProbeResult(400, "Throttling: Rate exceeded", False, rate_limited=True),
+    checker.ProbeResult(503, "Service Unavailable", False),
+])
+def test_result_cache_skips_transient_results(tmp_path, result):
+    cache = checker.ResultCache(str(tmp_path))
+    entry = cache.entry_id('github', 'User API', GITHUB_TOKEN)
+    cache.put(entry, result)
+    assert cache.get(entry) is None
+    cache.close()
+
+
+def test_result_cache_keeps_definitive_results(tmp_path):
+    cache = checker.ResultCache(str(tmp_path))
+    entry = cache.entry_id('github', 'User API', GITHUB_TOKEN)
+    cache.put(entry, checker.ProbeResult(401, f"Bad credentials {GITHUB_TOKEN}", True), secrets=[GITHUB_TOKEN])
+    cached = cache.get(entry)
+    assert (cached.status_code, cached.fatal, cached.cached) == (401, True, True)
+    assert GITHUB_TOKEN not in cached.error_message
+    cache.close()
+
+
+def test_rerun_is_answered_from_the_cache(make_validator, mock, tmp_path):
+    for run in range(2):
+        cache = checker.ResultCache(str(tmp_path))
+        validator = make_validator(f"run{run}", cache=cache)
+        before = mock.counters()['requests']
+        with contextlib.redirect_stdout(io.StringIO()):
+            checker.process_key(validator, 'github', GITHUB_TOKEN)
+        validator.close()
+        sent = mock.counters()['requests'] - before
+        assert sent == (checker.endpoint_count('github') if run == 0 else 0)
+        assert (cache.hits, cache.misses) == ((0, 2) if run == 0 else (2, 0))
@@ -0,0 +1,61 @@
+import contextlib
+import io
+
+import pytest
+
+import main as checker
+from run import write_key_file
+
+
+def run_key_file(validator, key_file, checkpoint):
+    with contextlib.redirect_stdout(io.StringIO()):
+        counts = checker.process_key_file(str(key_file), validator, 'all', progress_interval=0, checkpoint=checkpoint)
+    validator.close()
+    return counts
+
+
+def test_checkpoint_resume_skips_finished_validations(make_validator, mock, tmp_path):
+    key_file = tmp_path / "keys.txt"
+    write_key_file(key_file, 9, seed=2)
+    with open(key_file) as f:
+        keys = f.read().split()
+    items = list(checker.KeyPrefilter('all').route(keys))
+    path = str(tmp_path / "run.checkpoint")
+
+    interrupted = checker.Checkpoint(path, "run", 'all', str(key_file), every=1)
+    for service, key in items[:4]:
+        interrupted.mark(service, key)
+    interrupted.close()
+
+    with pytest.raises(FileExistsError):
+        checker.Checkpoint(path, "run", 'all', str(key_file))
+
+    checkpoint = checker.Checkpoint(path, "run", 'all', str(key_file), resume=True)
+    assert checkpoint.mismatch is None
+    before = mock.counters()['requests']
+    validator = make_validator(run_id="run")
+    assert run_key_file(validator, key_file, checkpoint) == (5, 0, 0)
+    checkpoint.close()
+    assert checkpoint.resumed == 4
+    assert mock.counters()['requests'] - before == sum(checker.endpoint_count(service) for service, _ in items[4:])
+
+    # Every item is now recorded, so resuming again checks nothing
+    checkpoint = checker.Checkpoint(path, "run", 'all', str(key_file), resume=True)
+    assert list(checkpoint.skip_finished(items)) == []
+    checkpoint.close()
+
+
+def test_checkpoint_resume_reports_other_runs_settings(tmp_path):
+    path = str(tmp_path / "run.checkpoint")
+    checker.Checkpoint(path, "run", 'all', "keys.txt").close()
+    checkpoint = checker.Checkpoint(path, "run", 'github', "keys.txt", resume=True)
+    assert checkpoint.mismatch == "run run checked --service all --key-file keys.txt"
+    checkpoint.close()
+
+
+def test_same_second_runs_get_their_own_ids(tmp_path):
+    validators = [checker.APIValidator(log_dir=str(tmp_path), quiet=True) for _ in range(5)]
+    assert len({validator.timestamp for validator in validators}) == 5
+    assert len({validator.log_filename for validator in validators}) == 5
+    for validator in validators:
+        validator.close()
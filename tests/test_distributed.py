@@ -0,0 +1,71 @@
+import contextlib
+import io
+import random
+import socket
+import threading
+import time
+
+import main as checker
+from run import synthetic_key
+
+
+def test_shard_of_is_stable_across_runs():
+    # Shards are assigned on different hosts, so the hash must not be salted per process
+    assert [checker.shard_of(key, 4) for key in ('ghp_a', 'AIzaB', 'x', 'aws:AKIA,s')] == [1, 2, 3, 1]
+
+
+def test_shards_split_a_key_file_without_overlap():
+    rng = random.Random(5)
+    keys = [synthetic_key('github', rng) for _ in range(2000)]
+    shards = [[key for key in keys if checker.shard_of(key, 3) == index] for index in range(3)]
+    assert sorted(sum(shards, [])) == sorted(keys)
+    assert all(500 < len(shard) < 800 for shard in shards)
+
+
+def test_expired_lease_goes_to_the_next_worker(make_validator):
+    items = [('github', f"ghp_{index}") for index in range(3)]
+    coordinator = checker.Coordinator(make_validator(), items, "s3cret", batch_size=2, lease_timeout=0.05)
+
+    first = coordinator.take_batch('slow')
+    assert first['items'] == items[:2]
+    time.sleep(0.1)
+    second = coordinator.take_batch('fast')
+    assert second['items'] == items[:2] and second['batch_id'] != first['batch_id']
+
+    # The slow worker's late results are dropped; the batch only counts once
+    coordinator.complete_batch('slow', first['batch_id'], [2, 0, 0], [])
+    coordinator.complete_batch('fast', second['batch_id'], [2, 0, 0], [])
+    third = coordinator.take_batch('fast')
+    assert third['items'] == items[2:]
+    assert coordinator.take_batch('slow') == {'wait': 1}
+    coordinator.complete_batch('fast', third['batch_id'], [1, 0, 0], [])
+    assert coordinator.take_batch('slow') == {'done': True}
+    assert coordinator.counts == [3, 0, 0]
+    assert coordinator.workers == {'fast': 2}
+    assert coordinator.finished.is_set()
+
+
+def test_worker_checks_the_coordinators_keys(make_validator):
+    rng = random.Random(6)
+    items = [(service, synthetic_key(service, rng)) for service in ('github', 'google', 'azure') * 2]
+    coordinator = checker.Coordinator(make_validator("coordinator"), items, "s3cret", batch_size=4)
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+    served = {}
+    server = threading.Thread(target=lambda: served.update(counts=coordinator.serve('127.0.0.1', port, linger=1)))
+    server.start()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(50):
+            try:
+                counts = checker.run_worker(f"http://127.0.0.1:{port}", "s3cret", make_validator("worker"),
+                                            name="w1")
+                break
+            except OSError:
+                time.sleep(0.05)
+    server.join(timeout=10)
+
+    assert counts == served['counts'] == (6, 0, 0)
+    assert coordinator.workers == {'w1': 2}
+    assert sum(sum(statuses.values()) for statuses in coordinator.statuses.values()) == 2 * 2 + 2 * 4 + 2 * 2
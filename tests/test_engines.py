@@ -0,0 +1,95 @@
+import contextlib
+import io
+import random
+
+import pytest
+
+import main as checker
+from mock_provider import MockProvider
+from run import synthetic_key, write_key_file
+
+SEPARATOR = "-" * 60
+
+
+class RecordList:
+    """Takes the place of a ResultWriter and keeps the records in a list."""
+    def __init__(self, records):
+        self.records = records
+
+    def write(self, record):
+        self.records.append(record)
+
+    def close(self):
+        pass
+
+
+def run_key_file(validator, key_file, engine=None, **options):
+    with contextlib.redirect_stdout(io.StringIO()):
+        counts = checker.process_key_file(str(key_file), validator, 'all', engine, progress_interval=0, **options)
+    validator.close()
+    return counts
+
+
+def log_blocks(validator):
+    """The log's per-key blocks, without timings and in a fixed order."""
+    with open(validator.log_filename) as f:
+        lines = [line for line in f.read().splitlines() if not line.startswith("Timing:")]
+    return sorted("\n".join(lines).split(SEPARATOR))
+
+
+def test_thread_and_async_engines_log_the_same_results(make_validator, tmp_path):
+    pytest.importorskip("aiohttp")
+    key_file = tmp_path / "keys.txt"
+    write_key_file(key_file, 30, seed=1)
+
+    threaded = make_validator("thread", workers=4)
+    thread_counts = run_key_file(threaded, key_file)
+    concurrent = make_validator("async")
+    engine = checker.AsyncEngine(concurrent, concurrency=10, provider_concurrency=5)
+    async_counts = run_key_file(concurrent, key_file, engine)
+
+    assert thread_counts == async_counts == (30, 0, 0)
+    assert log_blocks(threaded) == log_blocks(concurrent)
+    assert any("VALIDATION FAILED" in block for block in log_blocks(threaded))
+
+
+def test_async_engine_retries_throttled_probes(make_validator):
+    pytest.importorskip("aiohttp")
+    mock = MockProvider(latency=0, jitter=0, error_ratio=0, burst_every=1000, burst_length=3,
+                        retry_after='0.2', burst_provider='github').start()
+    try:
+        records = []
+        validator = make_validator(results_writer=RecordList(records),
+                                   base_urls={name: mock.url for name in checker.BASE_URLS})
+        rng = random.Random(4)
+        items = [(service, synthetic_key(service, rng)) for service in ('github', 'google', 'azure') * 3]
+        with contextlib.redirect_stdout(io.StringIO()):
+            counts = checker.validate_items(items, validator, checker.AsyncEngine(validator, concurrency=4))
+        validator.close()
+    finally:
+        mock.stop()
+
+    assert counts == (9, 0, 0)
+    assert len(records) == 3 * 2 + 3 * 4 + 3 * 2
+    assert not [record for record in records if record['status'] == "RATE LIMITED"]
+    assert sum(record['retries'] for record in records if record['provider'] == 'GitHub') == 2
+
+
+@pytest.mark.parametrize("engine", ['thread', 'async'])
+def test_both_engines_report_connection_reuse(make_validator, mock, tmp_path, engine):
+    if engine == 'async':
+        pytest.importorskip("aiohttp")
+    key_file = tmp_path / "keys.txt"
+    write_key_file(key_file, 12, seed=2)
+    validator = make_validator(engine, workers=2)
+    before = mock.counters()['requests']
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        checker.process_key_file(str(key_file), validator, 'all',
+                                 checker.AsyncEngine(validator, concurrency=4) if engine == 'async' else None,
+                                 progress_interval=0)
+        validator.display_connection_summary()
+    sent = mock.counters()['requests'] - before
+    requests, connections = validator.connection_stats()
+    assert requests == sent and 0 < connections <= 4
+    assert f"Connections: {connections} opened for {sent} requests ({sent - connections} reused)" in output.getvalue()
@@ -0,0 +1,31 @@
+import pytest
+
+import main as checker
+
+
+def test_scan_fields_reads_fields_before_the_cut():
+    document = checker.scan_fields('{"status": "REQUEST_DENIED", "error": {"message": "bad key"}, "results": [1, 2')
+    assert document == {"status": "REQUEST_DENIED", "error": {"message": "bad key"}}
+    assert isinstance(document, checker.PartialDocument)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('{"a": 1, "b', {"a": 1}),
+    ('{"a": 1, "b": ', {"a": 1}),
+    ('{"a": "unterminated', {}),
+    ('  {', {}),
+    ('[{"a": 1}, ', None),
+    ('<html>', None),
+])
+def test_scan_fields_on_cut_off_bodies(text, expected):
+    assert checker.scan_fields(text) == expected
+
+
+def test_truncated_body_missing_a_field_is_no_error():
+    parse = checker.compile_parser([checker.compile_error_rule(
+        {"if_not_equal": {"status": "OK"}, "message": "error_message"}, "test")], strict_json=True)
+    assert parse(200, '{"results": [{"formatted_address": "New Yo', truncated=True) is None
+    assert parse(200, '{"status": "REQUEST_DENIED", "error_message": "invalid", "res',
+                 truncated=True) == "invalid"
+    with pytest.raises(ValueError):
+        parse(200, '<html><body>Service Unavai', truncated=True)
@@ -0,0 +1,37 @@
+import pytest
+
+import main as checker
+
+SQUARE_TOKEN = "EAAA" + "b" * 60
+FACEBOOK_TOKEN = "EAA" + "c" * 40
+AWS_KEY_ID = "AKIA" + "A" * 16
+GITHUB_TOKEN = "ghp_" + "a" * 36
+GOOGLE_KEY = "AIza" + "b" * 35
+
+
+@pytest.mark.parametrize("service, key, expected", [
+    ('all', GITHUB_TOKEN, (['github'], False)),
+    ('all', SQUARE_TOKEN, (['square'], False)),
+    ('all', FACEBOOK_TOKEN, (['facebook'], False)),
+    ('all', AWS_KEY_ID, (['aws'], False)),
+    ('all', f"{AWS_KEY_ID},secret", (['aws'], False)),
+    ('all', "not,an,aws,pair", ([], False)),
+    ('github', GOOGLE_KEY, (['google'], True)),
+    ('github', GITHUB_TOKEN, (['github'], False)),
+    ('gitlab', AWS_KEY_ID, ([], False)),
+    ('gitlab', f"{AWS_KEY_ID},secret", (['aws'], True)),
+    ('aws', AWS_KEY_ID, (['aws'], False)),
+])
+def test_prefilter_targets(service, key, expected):
+    assert checker.KeyPrefilter(service).targets(key) == expected
+
+
+def test_prefilter_without_classification_keeps_the_baseline():
+    assert checker.KeyPrefilter('all', classify=False).targets(GITHUB_TOKEN) == (list(checker.HTTP_PROVIDERS), False)
+
+
+def test_prefilter_route_drops_duplicates_and_honours_tags():
+    prefilter = checker.KeyPrefilter('all')
+    routed = list(prefilter.route([GITHUB_TOKEN, GITHUB_TOKEN, f"google:{GITHUB_TOKEN}", "x"]))
+    assert routed == [('github', GITHUB_TOKEN), ('google', GITHUB_TOKEN)]
+    assert (prefilter.duplicates, prefilter.tagged, prefilter.rejected) == (1, 1, 1)
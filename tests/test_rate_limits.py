@@ -0,0 +1,113 @@
+import contextlib
+import io
+import random
+import time
+from email.utils import formatdate
+
+import pytest
+
+import main as checker
+from mock_provider import MockProvider
+from run import synthetic_key
+
+
+@pytest.mark.parametrize("headers, expected", [
+    ({'Retry-After': '7'}, 7),
+    ({'Retry-After': '120'}, 30),
+    ({'Retry-After': '-5'}, 0),
+])
+def test_retry_policy_follows_retry_after(headers, expected):
+    assert checker.RetryPolicy(max_delay=30).delay(0, headers) == expected
+
+
+def test_retry_policy_reads_http_dates_and_rate_limit_resets():
+    policy = checker.RetryPolicy()
+    assert 8 <= policy.delay(0, {'Retry-After': formatdate(time.time() + 10, usegmt=True)}) <= 10
+    assert 4 <= policy.delay(0, {'X-RateLimit-Reset': str(int(time.time()) + 5)}) <= 5
+
+
+def test_retry_policy_backs_off_exponentially_with_jitter():
+    policy = checker.RetryPolicy(base_delay=1, max_delay=60)
+    for attempt in range(4):
+        delays = [policy.delay(attempt, {}) for _ in range(50)]
+        assert all(0.5 * 2 ** attempt <= delay <= 1.5 * 2 ** attempt for delay in delays)
+        assert len(set(delays)) > 1
+    assert policy.delay(10, None) == 60
+
+
+@pytest.mark.parametrize("status_code, headers, text, expected", [
+    (429, {}, "", True),
+    (403, {'X-RateLimit-Remaining': '0'}, "", True),
+    (403, {}, "You have exceeded a secondary Rate Limit", True),
+    (403, {'X-RateLimit-Remaining': '42'}, "Resource not accessible by integration", False),
+    (401, {}, "rate limit", False),
+    (200, None, "", False),
+])
+def test_is_throttled(status_code, headers, text, expected):
+    assert checker.is_throttled(status_code, headers, text) is expected
+
+
+def test_token_bucket_spends_the_burst_then_paces():
+    bucket = checker.TokenBucket(rate=10, burst=3)
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+    # Time passing between calls refills a little, so only bound the waits
+    first, second = bucket.reserve(), bucket.reserve()
+    assert 0.05 < first <= 0.1
+    assert first + 0.05 < second <= 0.2
+
+
+def test_token_bucket_pause_holds_every_caller_back():
+    bucket = checker.TokenBucket()
+    assert bucket.reserve() == 0
+    bucket.pause(5)
+    bucket.pause(1)
+    assert 4.9 < bucket.reserve() <= 5
+
+
+class RecordTimes:
+    """Takes the place of a ResultWriter and notes when each record arrives."""
+    def __init__(self):
+        self.records = []
+
+    def write(self, record):
+        self.records.append((time.monotonic(), record))
+
+    def close(self):
+        pass
+
+
+def test_throttled_provider_does_not_hold_up_the_others(make_validator, tmp_path):
+    # Only Google is throttled, for its first request, and asks for a 1s pause
+    mock = MockProvider(latency=0, jitter=0, error_ratio=0, burst_every=1000, burst_length=2,
+                        retry_after='1', burst_provider='google').start()
+    try:
+        # Google on its own host name, so its pause leaves the others' bucket alone
+        google_url = mock.url.replace("127.0.0.1", "localhost")
+        recorder = RecordTimes()
+        validator = make_validator(results_writer=recorder, base_urls=dict(
+            {name: mock.url for name in checker.BASE_URLS},
+            **{name: google_url for name in checker.BASE_URLS if name.startswith('google')}))
+        rng = random.Random(3)
+        items = [('google', synthetic_key('google', rng))] + [('github', synthetic_key('github', rng))
+                                                                for _ in range(5)]
+
+        started = time.monotonic()
+        with contextlib.redirect_stdout(io.StringIO()):
+            counts = checker.validate_items(items, validator)
+        validator.close()
+    finally:
+        mock.stop()
+
+    assert counts == (6, 0, 0)
+    github = [at for at, record in recorder.records if record['provider'] == 'GitHub']
+    google = [(at, record) for at, record in recorder.records if record['provider'] == 'Google']
+    assert len(github) == 10 and len(google) == 4
+    # The GitHub keys finished while Google was paused, not after it
+    assert max(github) - started < 0.9
+    assert min(at for at, _ in google) - started >= 0.9
+    # The throttled probe was retried once; the others went out after the pause
+    assert sorted(record['retries'] for _, record in google) == [0, 0, 0, 1]
+    assert all(record['status'] != "RATE LIMITED" for _, record in google)
+    with open(validator.log_filename) as f:
+        blocks = f.read().split("-" * 60)
+    assert "=== GitHub" in blocks[0] and "=== Google" in blocks[5] and blocks[5].count("=== Google") == 1
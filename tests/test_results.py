@@ -0,0 +1,53 @@
+import csv
+import io
+import json
+
+import pytest
+
+import main as checker
+
+
+def record(status, key_id="ghp_ab...wxyz"):
+    return dict({field: None for field in checker.RESULT_FIELDS}, provider="GitHub", endpoint="User API",
+                key_id=key_id, status=status)
+
+
+def write_records(path, records, format, append=False, stream=None):
+    writer = checker.ResultWriter(path, format, append=append, stream=stream)
+    for each in records:
+        writer.write(each)
+    writer.close()
+
+
+def test_csv_header_is_written_once_across_a_resume(tmp_path):
+    path = str(tmp_path / "results.csv")
+    write_records(path, [record("VALID")], "csv")
+    write_records(path, [record("INVALID")], "csv", append=True)
+    with open(path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [row['status'] for row in rows] == ["VALID", "INVALID"]
+    assert list(rows[0]) == list(checker.RESULT_FIELDS)
+
+
+@pytest.mark.parametrize("create", [False, True])
+def test_csv_append_to_a_missing_or_empty_file_writes_the_header(tmp_path, create):
+    path = tmp_path / "results.csv"
+    if create:
+        path.write_text("")
+    write_records(str(path), [record("VALID")], "csv", append=True)
+    assert path.read_text().splitlines()[0] == ",".join(checker.RESULT_FIELDS)
+
+
+def test_without_append_the_file_starts_over(tmp_path):
+    path = str(tmp_path / "results.jsonl")
+    write_records(path, [record("VALID"), record("VALID")], "jsonl")
+    write_records(path, [record("INVALID")], "jsonl")
+    with open(path) as f:
+        assert [json.loads(line)['status'] for line in f] == ["INVALID"]
+
+
+def test_dash_writes_to_the_given_stream():
+    stream = io.StringIO()
+    write_records('-', [record("VALID")], "jsonl", stream=stream)
+    assert json.loads(stream.getvalue())['status'] == "VALID"
+    assert not stream.closed
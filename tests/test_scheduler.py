@@ -0,0 +1,78 @@
+import contextlib
+import io
+import random
+import time
+
+import pytest
+
+import main as checker
+from mock_provider import MockProvider
+from run import synthetic_key
+
+
+@pytest.mark.parametrize("line, expected", [
+    ("github:ghp_abc", ('github', "ghp_abc")),
+    ("GitHub: ghp_abc ", ('github', "ghp_abc")),
+    ("aws:AKIAX,secret", ('aws', "AKIAX,secret")),
+    ("nope:abc", (None, "nope:abc")),
+    ("https://example.com/key", (None, "https://example.com/key")),
+    ("ghp_abc", (None, "ghp_abc")),
+])
+def test_split_service_tag(line, expected):
+    assert checker.split_service_tag(line) == expected
+
+
+def test_scheduler_interleaves_providers():
+    items = [('azure', f"a{index}") for index in range(6)] + [('github', f"g{index}") for index in range(3)]
+    scheduler = checker.ProviderScheduler(items)
+    # Let the feeder read everything ahead
+    time.sleep(0.1)
+    taken = []
+    for _ in range(6):
+        service, key = scheduler.take()
+        taken.append(service)
+        scheduler.done(service)
+    assert taken == ['azure', 'github'] * 3
+    assert list(scheduler) == [('azure', "a3"), ('azure', "a4"), ('azure', "a5")]
+
+
+def test_scheduler_favours_the_provider_with_fewer_keys_in_flight():
+    items = [('azure', f"a{index}") for index in range(4)] + [('github', f"g{index}") for index in range(4)]
+    scheduler = checker.ProviderScheduler(items)
+    time.sleep(0.1)
+    # Two slow Azure keys still running: GitHub gets the next free workers
+    assert [scheduler.take()[0] for _ in range(2)] == ['azure', 'github']
+    scheduler.done('github')
+    assert [scheduler.take()[0] for _ in range(2)] == ['github', 'azure']
+
+
+class ProviderOrder:
+    """Takes the place of a ResultWriter and notes the provider of each record."""
+    def __init__(self):
+        self.providers = []
+
+    def write(self, record):
+        self.providers.append(record['provider'])
+
+    def close(self):
+        pass
+
+
+def test_slow_provider_does_not_hold_up_the_others(make_validator):
+    # Azure answers in 300ms, GitHub at once; 4 workers, Azure keys first in the file
+    mock = MockProvider(latency=0, jitter=0, error_ratio=0, provider_latency={'azure': 300}).start()
+    try:
+        order = ProviderOrder()
+        validator = make_validator(workers=4, results_writer=order,
+                                   base_urls={name: mock.url for name in checker.BASE_URLS})
+        rng = random.Random(10)
+        items = ([('azure', synthetic_key('azure', rng)) for _ in range(8)]
+                 + [('github', synthetic_key('github', rng)) for _ in range(8)])
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert checker.validate_items(items, validator) == (16, 0, 0)
+        validator.close()
+    finally:
+        mock.stop()
+    # Every key has two endpoints. In file order the GitHub keys would wait
+    # behind all sixteen Azure records; with the scheduler they run alongside
+    assert order.providers.index('GitHub') < 8
@@ -0,0 +1,70 @@
+import contextlib
+import io
+import json
+import random
+
+import pytest
+
+import main as checker
+from run import synthetic_key
+
+
+@pytest.fixture
+def key_server(make_validator):
+    validator = make_validator(workers=2)
+    server = checker.KeyServer(validator)
+    # serve() does this before reading requests
+    validator.results_writer = server.collector
+    yield server
+    server.pool.shutdown()
+
+
+def expected_status(mock, key):
+    return "VALID" if mock.is_valid(key) else "INVALID"
+
+
+def test_handle_routes_an_untagged_key_by_its_format(key_server, mock):
+    key = synthetic_key('github', random.Random(7))
+    with contextlib.redirect_stdout(io.StringIO()):
+        reply = key_server.handle({'id': 1, 'key': key})
+    assert reply['id'] == 1
+    assert reply['services'] == ['github']
+    assert reply['key_id'] == checker.key_identifier(key)
+    assert reply['status'] == expected_status(mock, key)
+    assert [record['endpoint'] for record in reply['results']] == ["User API", "Repos API"]
+
+
+def test_handle_honours_the_service_field_and_tags(key_server, mock):
+    key = synthetic_key('azure', random.Random(8))
+    with contextlib.redirect_stdout(io.StringIO()):
+        tagged = key_server.handle({'id': 2, 'key': f"azure:{key}"})
+        named = key_server.handle({'id': 3, 'key': key, 'service': 'azure'})
+    assert tagged['services'] == named['services'] == ['azure']
+    assert tagged['status'] == named['status'] == expected_status(mock, key)
+
+
+@pytest.mark.parametrize("request_, expected", [
+    ({'id': 4}, {'id': 4, 'error': "request has no key"}),
+    ({'id': 5, 'key': "  "}, {'id': 5, 'error': "request has no key"}),
+    ({'id': 6, 'key': "abc", 'service': 'nope'}, {'id': 6, 'error': "unknown service 'nope'"}),
+])
+def test_handle_rejects_bad_requests(key_server, request_, expected):
+    assert key_server.handle(request_) == expected
+
+
+def test_handle_skips_keys_no_service_takes(key_server):
+    reply = key_server.handle({'id': 7, 'key': "x"})
+    assert (reply['services'], reply['status'], reply['results']) == ([], "SKIPPED", [])
+
+
+def test_serve_stream_answers_every_line(key_server):
+    rng = random.Random(9)
+    keys = [synthetic_key('github', rng) for _ in range(4)]
+    lines = [json.dumps({'id': index, 'key': key}) + "\n" for index, key in enumerate(keys)] + ["\n", "[1]\n"]
+    output = io.StringIO()
+    with contextlib.redirect_stdout(io.StringIO()):
+        key_server.serve_stream(lines, key_server.line_sender(output))
+    replies = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert sorted(reply['id'] for reply in replies if 'status' in reply) == [0, 1, 2, 3]
+    assert [reply for reply in replies if reply['id'] is None] == [
+        {'id': None, 'error': "bad request: expected a JSON object"}]